@@ -2,20 +2,29 @@
 
 import sys
 import os
+import collections
 
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaUI as omui
 import maya.cmds as cmds
+from maya.utils import executeDeferred
 
 from core import VamCore
 
-# Import hotkey context functions (will be available after setup)
-try:
-    from vam_commands import activate_vam_hotkey_context, deactivate_vam_hotkey_context
-    HOTKEY_CONTEXT_AVAILABLE = True
-except ImportError:
-    HOTKEY_CONTEXT_AVAILABLE = False
-    print("Warning: vam_commands not available, hotkey context will not be activated")
+# 'q' key (standard Maya exit) and Esc
+_EXIT_KEYS = frozenset((113, 4100))
+
+# Snapshots of queued events. An MEvent is only valid inside the context
+# callback, so the data VamCore needs is copied out before queueing.
+_MouseEvent = collections.namedtuple('_MouseEvent', ('position',))
+
+
+class _KeyEvent(collections.namedtuple('_KeyEvent', ('key_code',))):
+    """Key event snapshot, key() matches the MEvent accessor."""
+    __slots__ = ()
+    
+    def key(self):
+        return self.key_code
 
 
 def maya_useNewAPI():
@@ -28,6 +37,10 @@ class VamContext(omui.MPxContext):
     
     This context forwards all events to the VamCore state machine,
     allowing different states to handle events appropriately.
+    
+    Viewport callbacks only queue event snapshots, the queue is drained
+    into VamCore once Maya is idle so event arrival rate is decoupled
+    from handler cost.
     """
     
     def __init__(self):
@@ -38,68 +51,124 @@ class VamContext(omui.MPxContext):
         
         # Get VamCore singleton instance
         self.vam_core = VamCore()
+        
+        # (state, handler, event snapshot, is_drag) entries waiting for the
+        # next idle drain. Entries queued in a state that has been left by
+        # the time they are drained are dropped, never dispatched.
+        self._event_ring = collections.deque(maxlen=256)
+        self._drain_scheduled = False
+    
+    def _queue_event(self, handler, event, is_drag=False):
+        """
+        Queue an event snapshot, scheduling a drain if none is pending.
+        
+        Runs of drags in one state keep their first and newest entries
+        only: the first one can set the drag origin, in between only the
+        newest position matters.
+        
+        Args:
+            handler: VamCore handle_*_event method to call with the snapshot
+            event: Event snapshot
+            is_drag: Whether the snapshot comes from a drag event
+        """
+        ring = self._event_ring
+        state = self.vam_core.get_current_state()
+        if is_drag and len(ring) > 1:
+            last_state, _, _, last_is_drag = ring[-1]
+            prev_state, _, _, prev_is_drag = ring[-2]
+            if (last_is_drag and prev_is_drag
+                    and last_state == state and prev_state == state):
+                ring[-1] = (state, handler, event, True)
+                return
+        ring.append((state, handler, event, is_drag))
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            executeDeferred(self._drain_events)
+    
+    def _drain_events(self):
+        """Forward all queued events to VamCore, then update its state."""
+        self._drain_scheduled = False
+        ring = self._event_ring
+        vam_core = self.vam_core
+        try:
+            while ring:
+                state, handler, event, _ = ring.popleft()
+                # Input queued before a state change belongs to the old state
+                if state == vam_core.get_current_state():
+                    handler(event)
+            vam_core.update()
+        finally:
+            # A raising handler must not strand the remaining events
+            if ring and not self._drain_scheduled:
+                self._drain_scheduled = True
+                executeDeferred(self._drain_events)
 
     def toolOnSetup(self, event):
         """Called when tool becomes active."""
         print("VAM Tool Active")
         om.MGlobal.displayInfo("VAM: Modal tool active. Press 'q' or 'Esc' to exit.")
         
-        # Activate VAM hotkey context
-        if HOTKEY_CONTEXT_AVAILABLE:
-            activate_vam_hotkey_context()
+        # Activate VAM hotkey context, imported here so loading the plugin
+        # does not pull in the hotkey setup module
+        try:
+            from vam_commands import activate_vam_hotkey_context
+        except ImportError:
+            print("Warning: vam_commands not available, hotkey context will not be activated")
+            return
+        activate_vam_hotkey_context()
 
     def toolOffCleanup(self):
         """Called when tool is deactivated."""
         print("VAM Tool Deactivated")
         
+        # Drop input that has not been forwarded yet
+        self._event_ring.clear()
+        
         # Deactivate VAM hotkey context
-        if HOTKEY_CONTEXT_AVAILABLE:
-            deactivate_vam_hotkey_context()
+        try:
+            from vam_commands import deactivate_vam_hotkey_context
+        except ImportError:
+            return
+        deactivate_vam_hotkey_context()
 
     def doPress(self, event, drawMgr, frameContext):
         """
         Handle Mouse Down events.
         
-        Forward to state machine for processing by current state.
+        Queue for the state machine to process in the current state.
         """
-        # Forward event to state machine
-        self.vam_core.handle_mouse_event(event)
+        self._queue_event(self.vam_core.handle_mouse_event, _MouseEvent(event.position))
     
     def doRelease(self, event, drawMgr, frameContext):
         """
         Handle Mouse Release events.
         
-        Forward to state machine for processing by current state.
+        Queue for the state machine to process in the current state.
         """
-        # Forward event to state machine
-        self.vam_core.handle_mouse_event(event)
+        self._queue_event(self.vam_core.handle_mouse_event, _MouseEvent(event.position))
     
     def doDrag(self, event, drawMgr, frameContext):
         """
         Handle Mouse Drag events.
         
-        Forward to state machine for processing by current state.
+        Queue for the state machine to process in the current state.
         """
-        # Forward event to state machine
-        self.vam_core.handle_mouse_event(event)
+        self._queue_event(self.vam_core.handle_mouse_event, _MouseEvent(event.position), True)
         
     def doKeyDown(self, event):
         """
         Handle Keyboard Input while tool is active.
         
-        Forward to state machine for processing by current state.
+        Queue for the state machine to process in the current state.
         """
         key = event.key()
         
-        # 'q' key (standard Maya exit) or Esc - always exit tool
-        if key == 113 or key == 4100: 
-            print("Exiting VAM Tool...")
-            # Switch back to the standard Select Tool
+        # Exit keys always leave the tool, back to the standard Select Tool
+        if key in _EXIT_KEYS:
             cmds.setToolTo('selectSuperContext')
             return
         
-        # Forward keyboard event to state machine
-        self.vam_core.handle_key_event(event)
+        self._queue_event(self.vam_core.handle_key_event, _KeyEvent(key))
 
 
 class VamContextCmd(omui.MPxContextCommand):
@@ -1,16 +1,40 @@
 # -*- coding: utf-8 -*-
 
-import traceback
+import collections
+import functools
+import inspect
+import logging
+import sys
 from utils import singleton
 
+_LOG = logging.getLogger('vam')
+
+# Debug output is built only when enabled, state changes happen per keypress
+_DEBUG = False
+
+
+# VamCore state names, interned so state comparisons and dispatch lookups
+# can short-circuit on identity
+_S_NORMAL = sys.intern('normal')
+_S_MOVING = sys.intern('moving')
+_S_REG = sys.intern('register_picking')
+
+
+# State callbacks resolved on the model class, keyed by (class, states) and
+# shared by every machine of that class
+_CALLBACK_RESOLVE_CACHE = {}
 
 class StateMachine:
     """
     Generic declarative state machine.
     
     States and transitions are defined as configuration data.
-    The machine dynamically creates trigger methods based on transition definitions.
+    The model exposes triggers as plain methods that fire them on the machine.
     Callbacks can be specified for state entry/exit and transition events.
+    State callbacks (on_enter_<state>, on_exit_<state>, on_enter, on_exit)
+    are bound once when the machine is created; plain methods,
+    staticmethods, classmethods and callables set on the instance before
+    that point are all supported.
     
     Example usage:
         states = ['idle', 'running', 'stopped']
@@ -19,14 +43,19 @@ class StateMachine:
             {'trigger': 'stop', 'source': 'running', 'dest': 'stopped', 'after': 'on_stop'},
         ]
         
-        machine = StateMachine(
-            model=my_obj,
-            states=states,
-            transitions=transitions,
-            initial='idle'
-        )
+        class MyModel:
+            def __init__(self):
+                self.machine = StateMachine(
+                    model=self,
+                    states=states,
+                    transitions=transitions,
+                    initial='idle'
+                )
+            
+            def start(self):
+                return self.machine._fire('start')
         
-        # Triggers become methods on the model
+        my_obj = MyModel()
         my_obj.start()  # Transitions from idle to running
     """
     
@@ -37,48 +66,59 @@ class StateMachine:
         Args:
             model: Object that owns this state machine (callbacks are called on this object)
             states: List of state names (strings)
-            transitions: List of transition dicts with keys:
-                - trigger: Name of the trigger method to create
+            transitions: Sequence of transition dicts with keys:
+                - trigger: Name of the trigger
                 - source: Source state name (or list of source states)
                 - dest: Destination state name
                 - before: (optional) Callback method name to call before transition
                 - after: (optional) Callback method name to call after transition
-            initial: Name of the initial state (default: 'initial')
+            initial: Name of the initial state, must be one of states
+                (default: 'initial')
         """
         self.model = model
-        self.states = states
+        self.states = tuple(states)
         self.transitions = transitions
-        self.state = initial
         
-        # Build transition lookup for quick access
+        # States are tracked by index internally, names are only used at the
+        # edges (configuration, callbacks, get_state)
+        self._state_id = {name: i for i, name in enumerate(self.states)}
+        self._state_idx = self._state_id[initial]
+        
+        # Resolve model callbacks once so transitions skip attribute probes
+        key = (type(model), self.states)
+        resolved = _CALLBACK_RESOLVE_CACHE.get(key)
+        if resolved is None:
+            resolved = (
+                self._resolve_state_callbacks('on_enter'),
+                self._resolve_state_callbacks('on_exit'),
+            )
+            _CALLBACK_RESOLVE_CACHE[key] = resolved
+        self._on_enter = self._bind_state_callbacks(resolved[0])
+        self._on_exit = self._bind_state_callbacks(resolved[1])
+        
+        # Build transition lookup with resolved callbacks
         self._transition_map = {}
         for trans in transitions:
             trigger = trans['trigger']
             if trigger not in self._transition_map:
                 self._transition_map[trigger] = []
-            self._transition_map[trigger].append(trans)
+            self._transition_map[trigger].append(self._resolve_transition(trans))
+        self._triggers = frozenset(self._transition_map)
         
-        # Dynamically add trigger methods to the model
-        for trigger in self._transition_map.keys():
-            self._add_trigger(trigger)
+        # (trigger, source state index) -> transition, first matching
+        # definition wins
+        self._dispatch = {}
+        for trigger, group in self._transition_map.items():
+            for trans in group:
+                for source_idx in trans['_source_ids']:
+                    self._dispatch.setdefault((trigger, source_idx), trans)
         
         # Call on_enter for initial state
-        self._call_state_callback('on_enter', initial)
+        on_enter = self._on_enter[self._state_idx]
+        if on_enter:
+            on_enter()
     
-    def _add_trigger(self, trigger_name):
-        """
-        Dynamically add a trigger method to the model.
-        
-        Args:
-            trigger_name: Name of the trigger
-        """
-        def trigger_method(*args, **kwargs):
-            return self._execute_trigger(trigger_name, *args, **kwargs)
-        
-        # Add method to model instance
-        setattr(self.model, trigger_name, trigger_method)
-    
-    def _execute_trigger(self, trigger_name, *args, **kwargs):
+    def _fire(self, trigger_name, *args, **kwargs):
         """
         Execute a trigger, causing a state transition if valid.
         
@@ -89,86 +129,162 @@ class StateMachine:
         Returns:
             bool: True if transition occurred, False otherwise
         """
-        if trigger_name not in self._transition_map:
-            print(f"Warning: Trigger '{trigger_name}' not defined")
-            return False
+        old_idx = self._state_idx
         
         # Find valid transition from current state
-        valid_transition = None
-        for trans in self._transition_map[trigger_name]:
-            source = trans['source']
-            # Support single source or list of sources
-            sources = [source] if isinstance(source, str) else source
-            
-            if self.state in sources:
-                valid_transition = trans
-                break
+        valid_transition = self._dispatch.get((trigger_name, old_idx))
         
-        if not valid_transition:
-            print(f"Cannot trigger '{trigger_name}' from state '{self.state}'")
-            print(traceback.print_stack())
+        if valid_transition is None:
+            if trigger_name not in self._triggers:
+                print(f"Warning: Trigger '{trigger_name}' not defined")
+                return False
+            if _DEBUG:
+                _LOG.debug("Cannot trigger '%s' from state '%s'",
+                           trigger_name, self.state, stack_info=True)
             return False
         
-        old_state = self.state
-        new_state = valid_transition['dest']
+        new_idx = valid_transition['_dest_idx']
         
         # Execute before callback if defined
-        if 'before' in valid_transition:
-            self._call_callback(valid_transition['before'], *args, **kwargs)
+        callback = valid_transition['_before']
+        if callback:
+            callback(*args, **kwargs)
         
         # Exit old state
-        self._call_state_callback('on_exit', old_state)
+        callback = self._on_exit[old_idx]
+        if callback:
+            callback()
         
         # Change state
-        self.state = new_state
+        self._state_idx = new_idx
         
         # Enter new state
-        self._call_state_callback('on_enter', new_state)
+        callback = self._on_enter[new_idx]
+        if callback:
+            callback()
         
         # Execute after callback if defined
-        if 'after' in valid_transition:
-            self._call_callback(valid_transition['after'], *args, **kwargs)
+        callback = valid_transition['_after']
+        if callback:
+            callback(*args, **kwargs)
         
         return True
     
-    def _call_callback(self, callback_name, *args, **kwargs):
+    def _resolve_callback(self, callback_name):
         """
-        Call a callback method on the model if it exists.
+        Look up a callback method on the model.
         
         Args:
-            callback_name: Name of the callback method
-            *args, **kwargs: Arguments to pass to callback
+            callback_name: Name of the callback method, or None
+        
+        Returns:
+            Bound callback, or None if the model does not define it
         """
-        if hasattr(self.model, callback_name):
-            callback = getattr(self.model, callback_name)
-            if callable(callback):
-                callback(*args, **kwargs)
+        if callback_name is None:
+            return None
+        callback = getattr(self.model, callback_name, None)
+        return callback if callable(callback) else None
     
-    def _call_state_callback(self, callback_prefix, state_name):
+    def _resolve_transition(self, trans):
         """
-        Call a state-specific callback like on_enter_statename or on_exit_statename.
+        Copy a transition definition with its callbacks resolved on the model.
+        
+        Args:
+            trans: Transition dict
+        
+        Returns:
+            dict: Transition with source and destination state indices
+                ('_source_ids', '_dest_idx') and '_before' and '_after'
+                callbacks (or None)
+        """
+        source = trans['source']
+        sources = [source] if isinstance(source, str) else source
+        resolved = dict(trans)
+        resolved['_source_ids'] = frozenset(self._state_id[name] for name in sources)
+        resolved['_dest_idx'] = self._state_id[trans['dest']]
+        resolved['_before'] = self._resolve_callback(trans.get('before'))
+        resolved['_after'] = self._resolve_callback(trans.get('after'))
+        return resolved
+    
+    def _resolve_state_callbacks(self, callback_prefix):
+        """
+        Resolve state callbacks like on_enter_statename or on_exit_statename.
+        
+        Callbacks are looked up statically on the model class so the result
+        can be shared by every machine of that class; binding happens per
+        machine in _bind_state_callbacks. A state-specific callback takes
+        precedence; otherwise the generic callback (e.g. on_enter) is used
+        with the state name as argument.
         
         Args:
             callback_prefix: 'on_enter' or 'on_exit'
-            state_name: Name of the state
+        
+        Returns:
+            tuple: ((name, descriptor), (generic_name, generic_descriptor))
+                per state index; descriptors are None when not defined
+        """
+        model_class = type(self.model)
+        generic = inspect.getattr_static(model_class, callback_prefix, None)
+        callbacks = []
+        for state_name in self.states:
+            name = f"{callback_prefix}_{state_name}"
+            callback = inspect.getattr_static(model_class, name, None)
+            callbacks.append(((name, callback), (callback_prefix, generic)))
+        return tuple(callbacks)
+    
+    def _bind_callback(self, name, descriptor):
+        """
+        Bind one callback to the model.
+        
+        An attribute set on the model instance wins over the class
+        attribute; otherwise the class attribute is bound through its own
+        descriptor protocol, so staticmethods and classmethods work too.
+        
+        Args:
+            name: Attribute name of the callback
+            descriptor: Class attribute found by inspect.getattr_static
+        
+        Returns:
+            callable or None
         """
-        # Try specific callback like on_enter_normal
-        specific_callback = f"{callback_prefix}_{state_name}"
-        if hasattr(self.model, specific_callback):
-            callback = getattr(self.model, specific_callback)
-            if callable(callback):
-                callback()
-                return
-        
-        # Fall back to generic callback like on_enter with state as argument
-        if hasattr(self.model, callback_prefix):
-            callback = getattr(self.model, callback_prefix)
-            if callable(callback):
-                callback(state_name)
+        model = self.model
+        instance_dict = getattr(model, '__dict__', None)
+        if instance_dict is not None and name in instance_dict:
+            callback = instance_dict[name]
+        elif hasattr(descriptor, '__get__'):
+            callback = descriptor.__get__(model, type(model))
+        else:
+            callback = descriptor
+        return callback if callable(callback) else None
+    
+    def _bind_state_callbacks(self, callbacks):
+        """
+        Bind resolved state callbacks to the model.
+        
+        Args:
+            callbacks: Result of _resolve_state_callbacks
+        
+        Returns:
+            tuple: Callable taking no arguments (or None) per state index
+        """
+        bound = []
+        for state_name, (specific, generic) in zip(self.states, callbacks):
+            callback = self._bind_callback(*specific)
+            if callback is None:
+                callback = self._bind_callback(*generic)
+                if callback is not None:
+                    callback = functools.partial(callback, state_name)
+            bound.append(callback)
+        return tuple(bound)
+    
+    @property
+    def state(self):
+        """Name of the current state."""
+        return self.states[self._state_idx]
     
     def get_state(self):
         """Get the current state name."""
-        return self.state
+        return self.states[self._state_idx]
     
     def is_state(self, state_name):
         """
@@ -180,7 +296,7 @@ class StateMachine:
         Returns:
             bool: True if in that state
         """
-        return self.state == state_name
+        return self.states[self._state_idx] == state_name
 
 
 @singleton
@@ -196,21 +312,30 @@ class VamCore:
     States and transitions are defined declaratively.
     """
     
+    # Fixed instance layout, trigger methods are defined on the class
+    __slots__ = (
+        'trs', 'axis', 'base',
+        'moving_initial_values', 'machine',
+        '_mouse_dispatch', '_key_dispatch', '_update_dispatch',
+        '_cur_mouse', '_cur_key', '_cur_update',
+        '_drag_queue',
+    )
+    
     # State definitions
-    states = ['normal', 'moving', 'register_picking']
+    states = (_S_NORMAL, _S_MOVING, _S_REG)
     
     # Transition definitions
-    # Creates trigger methods: to_moving(), to_normal(), to_register_picking()
-    transitions = [
-        {'trigger': 'to_moving', 'source': 'normal', 'dest': 'moving', 'before': 'before_moving'},
-        {'trigger': 'to_normal', 'source': ['moving', 'register_picking'], 'dest': 'normal', 'before': 'before_normal'},
-        {'trigger': 'to_register_picking', 'source': 'normal', 'dest': 'register_picking'},
-    ]
+    # Fired by the trigger methods to_moving(), to_normal(), to_register_picking()
+    transitions = (
+        {'trigger': 'to_moving', 'source': _S_NORMAL, 'dest': _S_MOVING, 'before': 'before_moving'},
+        {'trigger': 'to_normal', 'source': (_S_MOVING, _S_REG), 'dest': _S_NORMAL, 'before': 'before_normal'},
+        {'trigger': 'to_register_picking', 'source': _S_NORMAL, 'dest': _S_REG},
+    )
     
     # Available transform modes
-    trs_modes = ['translate', 'rotate', 'scale']
-    axes = ['none', 'x', 'y', 'z']
-    bases = ['screen', 'local', 'world']
+    trs_modes = ('translate', 'rotate', 'scale')
+    axes = ('none', 'x', 'y', 'z')
+    bases = ('screen', 'local', 'world')
     
     def __init__(self):
         """Initialize VamCore with state machine and default settings."""
@@ -222,96 +347,141 @@ class VamCore:
         # State-specific data
         self.moving_initial_values = {}
         
+        # Drag positions waiting for the next idle flush, bounded so a
+        # stalled flush cannot let the backlog grow without limit
+        self._drag_queue = collections.deque(maxlen=64)
+        
+        # Per-state event handlers, resolved once so event dispatch is a
+        # single call instead of an if/elif chain on every event
+        self._mouse_dispatch = {
+            _S_NORMAL: self._handle_mouse_normal,
+            _S_MOVING: self._handle_mouse_moving,
+            _S_REG: self._handle_mouse_register_picking,
+        }
+        self._key_dispatch = {
+            _S_NORMAL: self._handle_key_normal,
+            _S_MOVING: self._handle_key_moving,
+            _S_REG: self._handle_key_register_picking,
+        }
+        self._update_dispatch = {
+            _S_NORMAL: self._update_normal,
+            _S_MOVING: self._update_moving,
+            _S_REG: self._update_register_picking,
+        }
+        
         # Initialize state machine with declarative configuration
-        # This will automatically create to_moving(), to_normal(), etc. methods
         self.machine = StateMachine(
             model=self,
             states=self.states,
             transitions=self.transitions,
-            initial='normal'
+            initial=_S_NORMAL
         )
     
+    def _bind_state_handlers(self, state_name):
+        """
+        Point the current event handlers at the handlers of a state.
+        
+        Args:
+            state_name: Name of the state being entered
+        """
+        self._cur_mouse = self._mouse_dispatch[state_name]
+        self._cur_key = self._key_dispatch[state_name]
+        self._cur_update = self._update_dispatch[state_name]
+    
+    # Triggers
+    def to_moving(self):
+        """Transition to moving state."""
+        return self.machine._fire('to_moving')
+    
+    def to_normal(self):
+        """Transition to normal state."""
+        return self.machine._fire('to_normal')
+    
+    def to_register_picking(self):
+        """Transition to register picking state."""
+        return self.machine._fire('to_register_picking')
+    
     # State lifecycle callbacks
     def on_enter_normal(self):
         """Called when entering normal state."""
-        print("Entered NORMAL state - Selection mode active")
+        self._bind_state_handlers(_S_NORMAL)
+        if _DEBUG:
+            _LOG.debug("Entered NORMAL state - Selection mode active")
     
     def on_exit_normal(self):
         """Called when exiting normal state."""
-        print("Exiting NORMAL state")
+        if _DEBUG:
+            _LOG.debug("Exiting NORMAL state")
     
     def on_enter_moving(self):
         """Called when entering moving state."""
-        print("Entered MOVING state - Transform mode active")
+        self._bind_state_handlers(_S_MOVING)
+        if _DEBUG:
+            _LOG.debug("Entered MOVING state - Transform mode active")
         # Store initial transform values for potential reset
         self.moving_initial_values = {}
+        self._drag_queue.clear()
     
     def on_exit_moving(self):
         """Called when exiting moving state."""
-        print("Exiting MOVING state")
+        if _DEBUG:
+            _LOG.debug("Exiting MOVING state")
+        # Drop drag input that has not been flushed yet
+        self._drag_queue.clear()
         # Commit or cancel transform changes
         self.moving_initial_values = {}
     
     def on_enter_register_picking(self):
         """Called when entering register picking state."""
-        print("Entered REGISTER_PICKING state (not yet implemented)")
+        self._bind_state_handlers(_S_REG)
+        if _DEBUG:
+            _LOG.debug("Entered REGISTER_PICKING state (not yet implemented)")
     
     def on_exit_register_picking(self):
         """Called when exiting register picking state."""
-        print("Exiting REGISTER_PICKING state")
+        if _DEBUG:
+            _LOG.debug("Exiting REGISTER_PICKING state")
     
     # Transition callbacks
     def before_moving(self):
         """Called before transitioning to moving state."""
-        print("Preparing to enter moving mode...")
+        if _DEBUG:
+            _LOG.debug("Preparing to enter moving mode...")
     
     def before_normal(self):
         """Called before transitioning to normal state."""
-        print("Returning to normal mode...")
+        if _DEBUG:
+            _LOG.debug("Returning to normal mode...")
     
     # Event handlers
     def handle_mouse_event(self, event):
         """
         Handle mouse events based on current state.
         
+        Handlers only read event.position, so a snapshot exposing that
+        attribute can stand in for the Maya event. Queued drag positions
+        are applied on the next update().
+        
         Args:
-            event: Mouse event from Maya context
+            event: Mouse event from Maya context, or a snapshot of it
         """
-        current_state = self.machine.get_state()
-        
-        if current_state == 'normal':
-            self._handle_mouse_normal(event)
-        elif current_state == 'moving':
-            self._handle_mouse_moving(event)
-        elif current_state == 'register_picking':
-            self._handle_mouse_register_picking(event)
+        self._cur_mouse(event)
     
     def handle_key_event(self, event):
         """
         Handle keyboard events based on current state.
         
+        Handlers only call event.key(), so a snapshot exposing that
+        method can stand in for the Maya event.
+        
         Args:
-            event: Key event from Maya context
+            event: Key event from Maya context, or a snapshot of it
         """
-        current_state = self.machine.get_state()
-        
-        if current_state == 'normal':
-            self._handle_key_normal(event)
-        elif current_state == 'moving':
-            self._handle_key_moving(event)
-        elif current_state == 'register_picking':
-            self._handle_key_register_picking(event)
+        self._cur_key(event)
     
     def update(self):
         """Update current state."""
-        current_state = self.machine.get_state()
-        
-        if current_state == 'normal':
-            self._update_normal()
-        elif current_state == 'moving':
-            self._update_moving()
-        elif current_state == 'register_picking':
-            self._update_register_picking()
+        self._cur_update()
     
     # Normal state handlers
     def _handle_mouse_normal(self, event):
@@ -332,8 +502,42 @@ class VamCore:
     
     # Moving state handlers
     def _handle_mouse_moving(self, event):
-        """Handle mouse events in moving state."""
-        # TODO: Calculate transform based on mouse position and current settings
+        """
+        Handle mouse events in moving state.
+        
+        Maya can send drag events faster than the viewport redraws, so
+        positions are only queued here and applied on the next update().
+        The first position seen in the state is kept as the drag origin.
+        """
+        position = event.position
+        if 'start_xy' not in self.moving_initial_values:
+            self.moving_initial_values['start_xy'] = position
+        self._drag_queue.append(position)
+    
+    def _flush_mouse_moving(self):
+        """
+        Drain the drag queue into a single preview update.
+        
+        The preview only depends on the newest position relative to the
+        drag origin, so intermediate positions are discarded.
+        """
+        queue = self._drag_queue
+        if not queue:
+            return
+        latest_x, latest_y = queue[-1]
+        queue.clear()
+        start_x, start_y = self.moving_initial_values['start_xy']
+        self._process_mouse_moving(latest_x - start_x, latest_y - start_y)
+    
+    def _process_mouse_moving(self, delta_x, delta_y):
+        """
+        Update the transform preview for a cursor offset.
+        
+        Args:
+            delta_x: Horizontal cursor offset from the drag origin
+            delta_y: Vertical cursor offset from the drag origin
+        """
+        # TODO: Calculate transform based on cursor offset and current settings
         # TODO: Apply transform preview (non-committed)
         pass
     
@@ -346,8 +550,7 @@ class VamCore:
     
     def _update_moving(self):
         """Update moving state."""
-        # TODO: Continuously update transform preview
-        pass
+        self._flush_mouse_moving()
     
     # Register picking state handlers (stubs)
     def _handle_mouse_register_picking(self, event):
@@ -369,24 +572,27 @@ class VamCore:
     
     def is_normal(self):
         """Check if in normal state."""
-        return self.machine.is_state('normal')
+        return self.machine.is_state(_S_NORMAL)
     
     def is_moving(self):
         """Check if in moving state."""
-        return self.machine.is_state('moving')
+        return self.machine.is_state(_S_MOVING)
     
     def is_register_picking(self):
         """Check if in register picking state."""
-        return self.machine.is_state('register_picking')
+        return self.machine.is_state(_S_REG)
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
+    _DEBUG = True
+    
     # Test the state machine
     vam_core = VamCore()
     print(f"Initial state: {vam_core.get_current_state()}")
     print()
     
-    # Test transitions - these methods are created dynamically by StateMachine
+    # Test transitions
     print("Testing transition to moving state:")
     vam_core.to_moving()
     print(f"Current state: {vam_core.get_current_state()}")
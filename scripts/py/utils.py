@@ -4,12 +4,12 @@ import functools
 
 def singleton(cls):
     """Make a class a Singleton class (only one instance)"""
-    instances = {}
-
     @functools.wraps(cls)
     def wrapper_singleton(*args, **kwargs):
-        if cls not in instances:
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
+        instance = wrapper_singleton.instance
+        if instance is None:
+            instance = wrapper_singleton.instance = cls(*args, **kwargs)
+        return instance
 
+    wrapper_singleton.instance = None
     return wrapper_singleton
\ No newline at end of file
@@ -11,90 +11,108 @@ The separation allows:
 - Hotkey context provides key bindings specific to VAM tool
 """
 
+import logging
+import os
+
 import maya.cmds as cmds
-import maya.mel as mel
 from core import VamCore
 
 
+# VamCore is a singleton, resolve it once instead of on every hotkey
+_VAM = VamCore()
+
+# Setting changes are reported as info records, formatted only when the
+# 'vam' logger is enabled for them
+_log = logging.getLogger('vam').info
+
+# Per-step setup output, enabled with VAM_VERBOSE=1
+_VERBOSE = os.environ.get('VAM_VERBOSE') == '1'
+
+# Base space cycle order: screen -> local -> world -> screen
+_NEXT_BASE = {'screen': 'local', 'local': 'world', 'world': 'screen'}
+
+
 # ============================================================================
 # Command Functions - These will be bound to nameCommands
 # ============================================================================
 
 def vam_to_moving():
     """Transition to moving state."""
-    vam_core = VamCore()
-    vam_core.to_moving()
+    _VAM.to_moving()
 
 
 def vam_to_normal():
     """Transition to normal state."""
-    vam_core = VamCore()
-    vam_core.to_normal()
+    _VAM.to_normal()
 
 
 def vam_to_register_picking():
     """Transition to register picking state."""
-    vam_core = VamCore()
-    vam_core.to_register_picking()
-
-
-def vam_set_translate():
-    """Set transform mode to translate."""
-    vam_core = VamCore()
-    vam_core.trs = 'translate'
-    print(f"Transform mode: translate")
-
-
-def vam_set_rotate():
-    """Set transform mode to rotate."""
-    vam_core = VamCore()
-    vam_core.trs = 'rotate'
-    print(f"Transform mode: rotate")
+    _VAM.to_register_picking()
 
 
-def vam_set_scale():
-    """Set transform mode to scale."""
-    vam_core = VamCore()
-    vam_core.trs = 'scale'
-    print(f"Transform mode: scale")
-
-
-def vam_set_axis_x():
-    """Constrain to X axis."""
-    vam_core = VamCore()
-    vam_core.axis = 'x'
-    print(f"Axis constraint: X")
-
-
-def vam_set_axis_y():
-    """Constrain to Y axis."""
-    vam_core = VamCore()
-    vam_core.axis = 'y'
-    print(f"Axis constraint: Y")
-
-
-def vam_set_axis_z():
-    """Constrain to Z axis."""
-    vam_core = VamCore()
-    vam_core.axis = 'z'
-    print(f"Axis constraint: Z")
-
-
-def vam_set_axis_none():
-    """Remove axis constraint."""
-    vam_core = VamCore()
-    vam_core.axis = 'none'
-    print(f"Axis constraint: None")
+def _make_setter(name, attr, value, label, doc):
+    """
+    Create a hotkey command that sets one VamCore setting to a fixed value.
+    
+    Args:
+        name: Name of the generated function
+        attr: VamCore attribute to set ('trs' or 'axis')
+        value: Value to assign
+        label: Setting name used in the log record
+        doc: Docstring of the generated function
+    
+    Returns:
+        function: Command taking no arguments
+    """
+    def setter():
+        setattr(_VAM, attr, value)
+        _log('%s: %s', label, value)
+    
+    setter.__name__ = setter.__qualname__ = name
+    setter.__doc__ = doc
+    return setter
+
+
+# Setting commands, generating both the vam_set_* functions and their
+# runtime commands:
+# (function name, runtime command, attribute, value, log label, description)
+_SETTERS = (
+    ('vam_set_translate', 'vamSetTranslate', 'trs', 'translate', 'Transform mode', 'Set translate mode'),
+    ('vam_set_rotate', 'vamSetRotate', 'trs', 'rotate', 'Transform mode', 'Set rotate mode'),
+    ('vam_set_scale', 'vamSetScale', 'trs', 'scale', 'Transform mode', 'Set scale mode'),
+    ('vam_set_axis_x', 'vamSetAxisX', 'axis', 'x', 'Axis constraint', 'Constrain to X axis'),
+    ('vam_set_axis_y', 'vamSetAxisY', 'axis', 'y', 'Axis constraint', 'Constrain to Y axis'),
+    ('vam_set_axis_z', 'vamSetAxisZ', 'axis', 'z', 'Axis constraint', 'Constrain to Z axis'),
+    ('vam_set_axis_none', 'vamSetAxisNone', 'axis', 'none', 'Axis constraint', 'Remove axis constraint'),
+)
+
+_SETTER_FUNCTIONS = {
+    name: _make_setter(name, attr, value, label, f"{description}.")
+    for name, _, attr, value, label, description in _SETTERS
+}
+
+vam_set_translate = _SETTER_FUNCTIONS['vam_set_translate']
+vam_set_rotate = _SETTER_FUNCTIONS['vam_set_rotate']
+vam_set_scale = _SETTER_FUNCTIONS['vam_set_scale']
+vam_set_axis_x = _SETTER_FUNCTIONS['vam_set_axis_x']
+vam_set_axis_y = _SETTER_FUNCTIONS['vam_set_axis_y']
+vam_set_axis_z = _SETTER_FUNCTIONS['vam_set_axis_z']
+vam_set_axis_none = _SETTER_FUNCTIONS['vam_set_axis_none']
 
 
 def vam_cycle_base():
     """Cycle through base spaces: screen -> local -> world."""
-    vam_core = VamCore()
-    bases = ['screen', 'local', 'world']
-    current_idx = bases.index(vam_core.base)
-    next_idx = (current_idx + 1) % len(bases)
-    vam_core.base = bases[next_idx]
-    print(f"Base space: {vam_core.base}")
+    _VAM.base = _NEXT_BASE[_VAM.base]
+    _log('Base space: %s', _VAM.base)
+
+
+def vam_grab():
+    """Enter moving state from normal, otherwise set translate mode."""
+    if _VAM.is_normal():
+        _VAM.to_moving()
+    else:
+        vam_set_translate()
 
 
 # ============================================================================
@@ -104,6 +122,23 @@ def vam_cycle_base():
 VAM_HOTKEY_SET = "vamToolSet"
 VAM_HOTKEY_CONTEXT = "vamToolContext"
 
+# Whether VAM activated its hotkey context, toggled by
+# activate_vam_hotkey_context / deactivate_vam_hotkey_context
+_VAM_ACTIVE = False
+
+# Runtime commands besides the setting commands in _SETTERS:
+# (runtime command, function name, description)
+_COMMANDS = (
+    # State transitions
+    ('vamToMoving', 'vam_to_moving', 'Enter moving state'),
+    ('vamToNormal', 'vam_to_normal', 'Return to normal state'),
+    ('vamToRegisterPicking', 'vam_to_register_picking', 'Enter register picking state'),
+    ('vamGrabDispatch', 'vam_grab', 'Enter moving state, or set translate mode while moving'),
+    
+    # Base space
+    ('vamCycleBase', 'vam_cycle_base', 'Cycle base space (screen/local/world)'),
+)
+
 
 def create_vam_commands():
     """
@@ -111,80 +146,47 @@ def create_vam_commands():
     
     These commands are registered with Maya's command system using runTimeCommand.
     They can then be assigned to keys via nameCommand.
+    
+    The commands are created as default commands: they are recreated by this
+    function at every startup, so Maya does not save them to user prefs.
+    
+    Returns:
+        int: Number of VAM runtime commands
     """
+    setters = tuple(
+        (command_name, name, description)
+        for name, command_name, _, _, _, description in _SETTERS
+    )
     commands = [
-        # State transitions
-        {
-            'name': 'vamToMoving',
-            'annotation': 'VAM: Enter moving state',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_to_moving; vam_to_moving()'
-        },
-        {
-            'name': 'vamToNormal',
-            'annotation': 'VAM: Return to normal state',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_to_normal; vam_to_normal()'
-        },
         {
-            'name': 'vamToRegisterPicking',
-            'annotation': 'VAM: Enter register picking state',
+            'name': command_name,
+            'annotation': f'VAM: {description}',
             'category': 'VAM',
-            'command': 'from vam_commands import vam_to_register_picking; vam_to_register_picking()'
-        },
-        
-        # Transform modes
-        {
-            'name': 'vamSetTranslate',
-            'annotation': 'VAM: Set translate mode',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_set_translate; vam_set_translate()'
-        },
-        {
-            'name': 'vamSetRotate',
-            'annotation': 'VAM: Set rotate mode',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_set_rotate; vam_set_rotate()'
-        },
-        {
-            'name': 'vamSetScale',
-            'annotation': 'VAM: Set scale mode',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_set_scale; vam_set_scale()'
-        },
-        
-        # Axis constraints
-        {
-            'name': 'vamSetAxisX',
-            'annotation': 'VAM: Constrain to X axis',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_set_axis_x; vam_set_axis_x()'
-        },
-        {
-            'name': 'vamSetAxisY',
-            'annotation': 'VAM: Constrain to Y axis',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_set_axis_y; vam_set_axis_y()'
-        },
-        {
-            'name': 'vamSetAxisZ',
-            'annotation': 'VAM: Constrain to Z axis',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_set_axis_z; vam_set_axis_z()'
-        },
-        
-        # Base space
-        {
-            'name': 'vamCycleBase',
-            'annotation': 'VAM: Cycle base space (screen/local/world)',
-            'category': 'VAM',
-            'command': 'from vam_commands import vam_cycle_base; vam_cycle_base()'
-        },
+            'command': f'from vam_commands import {name}; {name}()'
+        }
+        for command_name, name, description in _COMMANDS + setters
     ]
     
+    # Query existing commands once instead of probing each name
+    registered = set(cmds.runTimeCommand(query=True, defaultCommandArray=True) or [])
+    saved = set(cmds.runTimeCommand(query=True, userCommandArray=True) or [])
+    
     for cmd in commands:
-        # Delete if exists
-        if cmds.runTimeCommand(cmd['name'], exists=True):
+        # Default commands cannot be deleted, update them in place so a
+        # reload followed by setup picks up changed definitions
+        if cmd['name'] in registered:
+            cmds.runTimeCommand(
+                cmd['name'],
+                edit=True,
+                annotation=cmd['annotation'],
+                category=cmd['category'],
+                command=cmd['command'],
+                commandLanguage='python'
+            )
+            continue
+        
+        # Remove copies saved to user prefs by earlier versions
+        if cmd['name'] in saved:
             cmds.runTimeCommand(cmd['name'], edit=True, delete=True)
         
         # Create runtime command
@@ -192,10 +194,15 @@ def create_vam_commands():
             cmd['name'],
             annotation=cmd['annotation'],
             category=cmd['category'],
-            command=cmd['command']
+            command=cmd['command'],
+            commandLanguage='python',
+            default=True
         )
         
-        print(f"Created runtime command: {cmd['name']}")
+        if _VERBOSE:
+            print(f"Created runtime command: {cmd['name']}")
+    
+    return len(commands)
 
 
 def create_vam_hotkey_context():
@@ -204,29 +211,38 @@ def create_vam_hotkey_context():
     
     This context is activated when the VAM tool becomes active,
     and deactivated when the tool is exited.
+    
+    Returns:
+        int: Number of key bindings
     """
-    # Create hotkey set & context if it doesn't exist
+    # Create hotkey set & context if it doesn't exist. A new set or context
+    # has no VAM bindings yet.
+    created = False
     if not cmds.hotkeySet(VAM_HOTKEY_SET, ex=True):
         cmds.hotkeySet(VAM_HOTKEY_SET, cu=True)
-        print(f"Created hotkey set: {VAM_HOTKEY_SET}")
+        created = True
+        if _VERBOSE:
+            print(f"Created hotkey set: {VAM_HOTKEY_SET}")
     if not cmds.hotkeyCtx(te=VAM_HOTKEY_CONTEXT, q=True):
         cmds.hotkeyCtx(ita=('', VAM_HOTKEY_CONTEXT))
-        print(f"Created hotkey context: {VAM_HOTKEY_CONTEXT}")
+        created = True
+        if _VERBOSE:
+            print(f"Created hotkey context: {VAM_HOTKEY_CONTEXT}")
     
     # Associate context with viewport panels (modelPanel)
     # This makes the context active when focus is in a 3D viewport
     cmds.hotkeyCtx(t=VAM_HOTKEY_CONTEXT, ac='modelPanel')
-    print(f"Associated {VAM_HOTKEY_CONTEXT} with modelPanel (3D viewports)")
+    if _VERBOSE:
+        print(f"Associated {VAM_HOTKEY_CONTEXT} with modelPanel (3D viewports)")
     
     # Define key bindings for VAM tool
     # Format: (key, modifier, command_name, press/release)
     key_bindings = [
         # State transitions
-        ('g', '', 'vamToMoving', True),        # 'g' to enter moving (like Blender)
+        ('g', '', 'vamGrabDispatch', True),    # 'g' to enter moving (like Blender), translate (grab) when moving
         ('Escape', '', 'vamToNormal', True),   # Escape to return to normal
         
         # Transform modes (when in moving state)
-        ('g', '', 'vamSetTranslate', True),    # 'g' for translate (grab)
         ('r', '', 'vamSetRotate', True),       # 'r' for rotate
         ('s', '', 'vamSetScale', True),        # 's' for scale
         
@@ -239,40 +255,38 @@ def create_vam_hotkey_context():
         ('Tab', '', 'vamCycleBase', True),     # Tab to cycle base space
     ]
     
+    # Delete existing bindings, only needed when the set and context existed
+    if not created:
+        for key in dict.fromkeys(binding[0] for binding in key_bindings):
+            try:
+                cmds.hotkey(
+                    keyShortcut=key,
+                    name='',  # Clear binding
+                    releaseName='',
+                    ctxClient=VAM_HOTKEY_CONTEXT
+                )
+            except RuntimeError:
+                pass
+    
+    # Create name commands and bind them in the VAM context with a single
+    # MEL evaluation instead of one Maya command call per step. maya.mel is
+    # only needed here, so it is not imported with the module.
+    import maya.mel as mel
+    
+    lines = []
     for key, modifier, command_name, is_press in key_bindings:
-        # Create name command if it doesn't exist
         name_cmd = f"{command_name}NameCommand"
-        cmds.nameCommand(name_cmd, annotation=f"{command_name}", command=command_name)
-        
-        # Bind to hotkey in VAM context
-        press_release = 'press' if is_press else 'release'
-        
-        # Delete existing binding if present
-        try:
-            cmds.hotkey(
-                keyShortcut=key,
-                name='',  # Clear binding
-                releaseName='',
-                ctxClient=VAM_HOTKEY_CONTEXT
-            )
-        except:
-            pass
-        
-        # Create new binding
-        if is_press:
-            cmds.hotkey(
-                keyShortcut=key,
-                name=name_cmd,
-                ctxClient=VAM_HOTKEY_CONTEXT
-            )
-        else:
-            cmds.hotkey(
-                keyShortcut=key,
-                releaseName=name_cmd,
-                ctxClient=VAM_HOTKEY_CONTEXT
-            )
-        
-        print(f"Bound {key} ({press_release}) to {command_name} in {VAM_HOTKEY_CONTEXT}")
+        lines.append(f'nameCommand -annotation "{command_name}" -command "{command_name}" {name_cmd};')
+        name_flag = '-name' if is_press else '-releaseName'
+        lines.append(f'hotkey -keyShortcut "{key}" {name_flag} "{name_cmd}" -ctxClient "{VAM_HOTKEY_CONTEXT}";')
+    mel.eval("\n".join(lines))
+    
+    if _VERBOSE:
+        for key, modifier, command_name, is_press in key_bindings:
+            press_release = 'press' if is_press else 'release'
+            print(f"Bound {key} ({press_release}) to {command_name} in {VAM_HOTKEY_CONTEXT}")
+    
+    return len(key_bindings)
 
 
 def activate_vam_hotkey_context():
@@ -282,6 +296,8 @@ def activate_vam_hotkey_context():
     Call this when the VAM tool becomes active.
     Sets the current client to the active modelPanel (3D viewport).
     """
+    global _VAM_ACTIVE
+    
     if not cmds.hotkeyCtx(VAM_HOTKEY_CONTEXT, exists=True):
         print(f"Warning: Hotkey context {VAM_HOTKEY_CONTEXT} does not exist")
         return
@@ -299,7 +315,8 @@ def activate_vam_hotkey_context():
         # This will work with any associated modelPanel
         cmds.hotkeyCtx(t=VAM_HOTKEY_CONTEXT, currentClient='modelPanel')
         print(f"Activated hotkey context: {VAM_HOTKEY_CONTEXT} (generic modelPanel)")
-
+    
+    _VAM_ACTIVE = True
 
 
 def deactivate_vam_hotkey_context():
@@ -308,9 +325,12 @@ def deactivate_vam_hotkey_context():
     
     Call this when the VAM tool is exited.
     """
+    global _VAM_ACTIVE
+    
     # Return to default hotkey context
     active_panel = cmds.getPanel(withFocus=True)
     cmds.hotkeyCtx(t="Global", cc=active_panel)
+    _VAM_ACTIVE = False
     print(f"Deactivated hotkey context, returned to Global")
 
 
@@ -320,17 +340,20 @@ def setup_vam_hotkeys():
     
     Call this during initialization (e.g., in userSetup.py).
     """
-    print("\n" + "="*60)
-    print("Setting up VAM commands and hotkeys...")
-    print("="*60)
+    if _VERBOSE:
+        print("\n" + "="*60)
+        print("Setting up VAM commands and hotkeys...")
+        print("="*60)
     
-    create_vam_commands()
-    create_vam_hotkey_context()
+    command_count = create_vam_commands()
+    binding_count = create_vam_hotkey_context()
     
-    print("="*60)
-    print("VAM hotkey setup complete!")
-    print(f"The context '{VAM_HOTKEY_CONTEXT}' will activate when VAM tool is active")
-    print("="*60 + "\n")
+    if _VERBOSE:
+        print("="*60)
+        print("VAM hotkey setup complete!")
+        print(f"The context '{VAM_HOTKEY_CONTEXT}' will activate when VAM tool is active")
+        print("="*60 + "\n")
+    print(f"VAM: {command_count} runtime cmds, {binding_count} bindings registered.")
 
 
 # ============================================================================
@@ -343,8 +366,14 @@ def get_current_hotkey_context():
 
 
 def is_vam_context_active():
-    """Check if VAM hotkey context is currently active."""
-    return get_current_hotkey_context() == VAM_HOTKEY_CONTEXT
+    """
+    Check if VAM hotkey context is currently active.
+    
+    Answered from the flag kept by activate/deactivate_vam_hotkey_context,
+    without querying Maya. The flag only records those calls, use
+    get_current_hotkey_context() to see the context Maya actually has.
+    """
+    return _VAM_ACTIVE
 
 
 if __name__ == '__main__':
@@ -3,26 +3,33 @@
 # author: Joey Skeys
 
 import maya.cmds as cmds
+from maya.utils import executeDeferred
 import traceback
 import sys
 import os
-from importlib import reload
 
 
 from tools import basic_test
-reload(basic_test)
+if os.environ.get('VAM_DEV'):
+    # Pick up live edits to the test tool during development
+    from importlib import reload
+    reload(basic_test)
+
+def setup_hotkeys():
+    # Setup VAM commands and hotkey context
+    try:
+        from vam_commands import setup_vam_hotkeys
+        setup_vam_hotkeys()
+    except Exception as e:
+        print("Warning: Failed to setup VAM hotkeys:")
+        print(traceback.format_exc())
 
 def initialize_vam():
     try:
         print("vam initializing...")
 
-        # Setup VAM commands and hotkey context
-        try:
-            from vam_commands import setup_vam_hotkeys
-            setup_vam_hotkeys()
-        except Exception as e:
-            print("Warning: Failed to setup VAM hotkeys:")
-            print(traceback.format_exc())
+        # Setup VAM commands and hotkey context once Maya is idle
+        executeDeferred(setup_hotkeys)
 
         # setup menus
 
@@ -33,7 +40,7 @@ def initialize_vam():
         cmds.vamCmd('vam')
 
         # test
-        basic_test.test_tool()
+        executeDeferred(basic_test.test_tool)
 
         print("vam initialized successfully")
     except Exception as e: